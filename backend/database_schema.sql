@@ -28,6 +28,7 @@ CREATE TABLE IF NOT EXISTS songs (
 -- Índices para optimizar consultas
 CREATE INDEX IF NOT EXISTS idx_songs_category ON songs(category);
 CREATE INDEX IF NOT EXISTS idx_songs_created_at ON songs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_songs_updated_at ON songs(updated_at);
 
 -- =====================================================
 -- NUEVAS TABLAS: SISTEMA DE NOTICIAS
@@ -78,6 +79,15 @@ CREATE TABLE IF NOT EXISTS news_posts (
         ON UPDATE CASCADE
 );
 
+-- TABLA: sync_tombstones
+-- Registra las filas eliminadas para que GET /sync pueda informar a los clientes
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id BIGSERIAL PRIMARY KEY,
+    table_name TEXT NOT NULL, -- 'songs' o 'news_posts'
+    row_id TEXT NOT NULL, -- id de la fila eliminada
+    deleted_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- =====================================================
 -- ÍNDICES PARA OPTIMIZACIÓN DE RENDIMIENTO
 -- =====================================================
@@ -87,6 +97,7 @@ CREATE INDEX IF NOT EXISTS idx_news_posts_category ON news_posts(category);
 CREATE INDEX IF NOT EXISTS idx_news_posts_published_date ON news_posts(published_date DESC);
 CREATE INDEX IF NOT EXISTS idx_news_posts_is_featured ON news_posts(is_featured);
 CREATE INDEX IF NOT EXISTS idx_news_posts_created_at ON news_posts(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_news_posts_updated_at ON news_posts(updated_at);
 
 -- Índice para búsqueda por tags usando GIN
 CREATE INDEX IF NOT EXISTS idx_news_posts_tags ON news_posts USING GIN(tags);
@@ -95,11 +106,15 @@ CREATE INDEX IF NOT EXISTS idx_news_posts_tags ON news_posts USING GIN(tags);
 CREATE INDEX IF NOT EXISTS idx_news_posts_category_published ON news_posts(category, published_date DESC);
 CREATE INDEX IF NOT EXISTS idx_news_posts_featured_published ON news_posts(is_featured, published_date DESC) WHERE is_featured = true;
 
+-- Índice para consultas incrementales de GET /sync
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_deleted_at ON sync_tombstones(deleted_at);
+
 -- =====================================================
 -- FUNCIONES DE UTILIDAD Y TRIGGERS
 -- =====================================================
 
 -- Función para actualizar updated_at automáticamente
+-- Se ejecuta también en INSERT para que la base de datos sea la única fuente de updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -110,16 +125,42 @@ $$ language 'plpgsql';
 
 -- Trigger para news_posts
 CREATE OR REPLACE TRIGGER update_news_posts_updated_at 
-    BEFORE UPDATE ON news_posts 
+    BEFORE INSERT OR UPDATE ON news_posts 
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
 -- Trigger para songs (si no existe)
 CREATE OR REPLACE TRIGGER update_songs_updated_at 
-    BEFORE UPDATE ON songs 
+    BEFORE INSERT OR UPDATE ON songs 
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Reloj de la base de datos para el cursor de GET /sync y de export_snapshot.py
+CREATE OR REPLACE FUNCTION sync_now()
+RETURNS TIMESTAMPTZ AS $$
+    SELECT NOW();
+$$ language 'sql' STABLE;
+
+-- Función para registrar tombstones de filas eliminadas
+CREATE OR REPLACE FUNCTION record_sync_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO sync_tombstones (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+-- Triggers de tombstones para news_posts y songs
+CREATE OR REPLACE TRIGGER record_news_posts_tombstone
+    AFTER DELETE ON news_posts
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
+CREATE OR REPLACE TRIGGER record_songs_tombstone
+    AFTER DELETE ON songs
+    FOR EACH ROW
+    EXECUTE FUNCTION record_sync_tombstone();
+
 -- =====================================================
 -- POLÍTICAS DE SEGURIDAD RLS (Row Level Security)
 -- =====================================================
@@ -129,12 +170,14 @@ ALTER TABLE songs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE news_posts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE news_categories ENABLE ROW LEVEL SECURITY;
 ALTER TABLE news_tags ENABLE ROW LEVEL SECURITY;
+ALTER TABLE sync_tombstones ENABLE ROW LEVEL SECURITY;
 
 -- Políticas para lectura pública (anyone can read)
 CREATE POLICY "Public read access" ON songs FOR SELECT TO anon, authenticated USING (true);
 CREATE POLICY "Public read access" ON news_posts FOR SELECT TO anon, authenticated USING (true);
 CREATE POLICY "Public read access" ON news_categories FOR SELECT TO anon, authenticated USING (true);
 CREATE POLICY "Public read access" ON news_tags FOR SELECT TO anon, authenticated USING (true);
+CREATE POLICY "Public read access" ON sync_tombstones FOR SELECT TO anon, authenticated USING (true);
 
 -- Políticas para escritura solo con service_role
 -- (Solo el backend con service_role key puede insertar/actualizar/eliminar)
@@ -142,6 +185,7 @@ CREATE POLICY "Service role full access" ON songs FOR ALL TO service_role USING
 CREATE POLICY "Service role full access" ON news_posts FOR ALL TO service_role USING (true);
 CREATE POLICY "Service role full access" ON news_categories FOR ALL TO service_role USING (true);
 CREATE POLICY "Service role full access" ON news_tags FOR ALL TO service_role USING (true);
+CREATE POLICY "Service role full access" ON sync_tombstones FOR ALL TO service_role USING (true);
 
 -- =====================================================
 -- DATOS INICIALES DE EJEMPLO
@@ -241,6 +285,19 @@ ENDPOINTS API IMPLEMENTADOS:
 - POST /news/categories - Crear categoría
 - GET /news/tags - Listar tags
 - POST /news/tags - Crear tag
+- GET /sync?since={cursor} - Cambios y tombstones desde el último cursor (el cursor es el reloj de la base de datos; reenvía SYNC_SAFETY_WINDOW segundos previos y el cliente deduplica por id)
+- GET /feed - Canciones recientes, noticias destacadas, categorías y tags (cacheado)
+
+SNAPSHOT ESTÁTICO (CDN/OFFLINE):
+- python backend/export_snapshot.py escribe shards JSON .gz versionados y manifest.json en SNAPSHOT_DIR
+- Solo se reescriben los shards cuyo contenido cambió desde la última exportación
+- Las lecturas de la API usan el snapshot si la base de datos no responde
+
+CONTROL DE ADMISIÓN:
+- Límites de concurrencia, cola y bytes por clase (reads, writes, uploads) vía ADMISSION_{CLASE}_{CONCURRENCY,QUEUE,MAX_BYTES,TIMEOUT}
+- Las escrituras excedentes reciben 429/503 con Retry-After; las lecturas tienen prioridad
+- GET /metrics expone profundidad de cola y rechazos en formato Prometheus
+- python backend/load_test.py compara el p99 de lecturas con y sin una tormenta de subidas
 
 CARACTERÍSTICAS IMPLEMENTADAS:
 ✅ Sistema de categorías con colores e iconos
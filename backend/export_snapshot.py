@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Script to export the read-only catalog as precompressed JSON shards for CDN/offline serving
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+from datetime import datetime, timedelta, timezone
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+    print("Error: SUPABASE_URL or SUPABASE_SERVICE_KEY not found in environment")
+    sys.exit(1)
+
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot"))
+MANIFEST_NAME = "manifest.json"
+NEWS_PAGE_SIZE = 20
+# Ids per in_() filter, so a big rebuild never turns into one oversized request URL
+POST_ID_CHUNK = 100
+# The cursor is the database clock when an export starts, but updated_at is the
+# start time of the writing transaction, so each export re-reads this many
+# seconds before the previous cursor (same window as GET /sync)
+SYNC_SAFETY_WINDOW = int(os.getenv("SYNC_SAFETY_WINDOW", "60"))
+
+def parse_timestamp(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def fetch_database_now() -> str:
+    # sync_now() is defined in database_schema.sql
+    return supabase.rpc("sync_now").execute().data
+
+def fetch_changes(since):
+    """Fetch rows changed at or after `since` (everything when None) and the deletions since then"""
+    songs_query = supabase.table("songs").select("id, updated_at")
+    news_query = supabase.table("news_posts").select("*")
+    tombstones = []
+    if since:
+        songs_query = songs_query.gte("updated_at", since)
+        news_query = news_query.gte("updated_at", since)
+        tombstones = supabase.table("sync_tombstones").select("table_name, row_id, deleted_at").gte("deleted_at", since).execute().data or []
+    songs = songs_query.execute().data or []
+    news = news_query.execute().data or []
+    # Category and tag metadata have no updated_at and are a handful of rows
+    categories = supabase.table("news_categories").select("*").order("name", desc=False).execute().data or []
+    tags = supabase.table("news_tags").select("*").order("name", desc=False).execute().data or []
+    return songs, news, tombstones, categories, tags
+
+def fetch_songs():
+    return supabase.table("songs").select("id, title, audio_url, cover_url, description, category").order("created_at", desc=True).execute().data or []
+
+def fetch_posts(post_ids):
+    ordered = sorted(post_ids)
+    posts = {}
+    for start in range(0, len(ordered), POST_ID_CHUNK):
+        res = supabase.table("news_posts").select("*").in_("id", ordered[start:start + POST_ID_CHUNK]).execute()
+        posts.update((row["id"], row) for row in res.data or [])
+    return posts
+
+def fetch_category_posts(name: str):
+    return supabase.table("news_posts").select("*").eq("category", name).execute().data or []
+
+def fetch_tag_posts(name: str):
+    return supabase.table("news_posts").select("*").contains("tags", [name]).execute().data or []
+
+def newest_first(posts):
+    return sorted(posts, key=lambda row: (parse_timestamp(row["published_date"]), row["id"]), reverse=True)
+
+def build_shards(previous, changed_songs, changed_news, tombstones, categories, tags):
+    """Build only the shards touched by the changed rows; a None payload removes the shard.
+
+    The manifest keeps a small index of every post (published_date, category,
+    tags, page) so the affected category, tag and page shards can be found
+    without reading the whole news_posts table; each one is then read with its
+    own filter.
+    """
+    previous_shards = previous["shards"] if previous else {}
+    index = {post_id: dict(entry) for post_id, entry in previous["posts"].items()} if previous else {}
+    old_members = {}
+    for post_id, entry in index.items():
+        old_members.setdefault(entry["page"], set()).add(post_id)
+
+    shards = {"news/categories": categories, "news/tags": tags}
+
+    if changed_songs or "songs" not in previous_shards or any(row["table_name"] == "songs" for row in tombstones):
+        shards["songs"] = fetch_songs()
+
+    rows = {row["id"]: row for row in changed_news}
+    deleted = {row["row_id"] for row in tombstones if row["table_name"] == "news_posts"} - rows.keys()
+    touched_categories = {row["name"] for row in categories if f"news/category/{row['name']}" not in previous_shards}
+    touched_tags = {row["name"] for row in tags if f"news/tag/{row['name']}" not in previous_shards}
+
+    for post_id in deleted | rows.keys():
+        old = index.pop(post_id, None)
+        if old:
+            touched_categories.add(old["category"])
+            touched_tags.update(old["tags"])
+    for post_id in deleted:
+        shards[f"news/post/{post_id}"] = None
+    for post_id, row in rows.items():
+        index[post_id] = {"published_date": row["published_date"], "category": row["category"], "tags": row.get("tags") or [], "page": None}
+        touched_categories.add(row["category"])
+        touched_tags.update(row.get("tags") or [])
+        shards[f"news/post/{post_id}"] = row
+
+    # Pages are numbered from the oldest post, so a new post only changes the last page
+    ordered = sorted(index, key=lambda post_id: (parse_timestamp(index[post_id]["published_date"]), post_id))
+    pages = [ordered[start:start + NEWS_PAGE_SIZE] for start in range(0, len(ordered), NEWS_PAGE_SIZE)]
+    touched_pages = []
+    for number, page in enumerate(pages, 1):
+        if set(page) != old_members.get(number, set()) or rows.keys() & set(page):
+            touched_pages.append(number)
+        for post_id in page:
+            index[post_id]["page"] = number
+    for number in range(len(pages) + 1, (previous["news_pages"] if previous else 0) + 1):
+        shards[f"news/page/{number}"] = None
+
+    needed = {post_id for number in touched_pages for post_id in pages[number - 1]}
+    posts = fetch_posts(needed - rows.keys())
+    posts.update(rows)
+    for number in touched_pages:
+        shards[f"news/page/{number}"] = [posts[post_id] for post_id in pages[number - 1] if post_id in posts]
+
+    category_names = {row["name"] for row in categories}
+    tag_names = {row["name"] for row in tags}
+    for name in touched_categories:
+        members = fetch_category_posts(name)
+        shards[f"news/category/{name}"] = newest_first(members) if members or name in category_names else None
+    for name in touched_tags:
+        members = fetch_tag_posts(name)
+        shards[f"news/tag/{name}"] = newest_first(members) if members or name in tag_names else None
+
+    return shards, index, len(pages)
+
+def slugify(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "shard"
+
+def shard_path(name: str, digest: str) -> str:
+    """Content-addressed path, so a shard file never changes once published"""
+    directory, _, leaf = name.rpartition("/")
+    filename = f"{slugify(leaf)}.{digest[:16]}.json.gz"
+    return f"{directory}/{filename}" if directory else filename
+
+def load_manifest():
+    path = os.path.join(SNAPSHOT_DIR, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def prune_unreferenced(*manifests):
+    """Remove shard files that neither the new nor the previous manifest points to"""
+    keep = {entry["path"] for manifest in manifests if manifest for entry in manifest["shards"].values()}
+    removed = 0
+    for root, _, files in os.walk(SNAPSHOT_DIR):
+        for filename in files:
+            if not filename.endswith(".json.gz"):
+                continue
+            full_path = os.path.join(root, filename)
+            if os.path.relpath(full_path, SNAPSHOT_DIR).replace(os.sep, "/") not in keep:
+                os.remove(full_path)
+                removed += 1
+    return removed
+
+def export_snapshot():
+    """Rebuild the shards touched by rows changed since the last export and write a new manifest"""
+    try:
+        previous = load_manifest()
+        # Manifests without a post index predate incremental exports: rebuild everything
+        compatible = previous if previous and "posts" in previous else None
+        previous_shards = previous["shards"] if previous else {}
+
+        cursor = compatible.get("source_cursor") if compatible else None
+        since = None
+        if cursor:
+            since = (parse_timestamp(cursor) - timedelta(seconds=SYNC_SAFETY_WINDOW)).isoformat()
+
+        print(f"📥 Fetching changes since {cursor or 'the beginning'}...")
+        # Read the clock before the rows, so anything committed later is at or after it
+        new_cursor = fetch_database_now()
+        songs, news, tombstones, categories, tags = fetch_changes(since)
+        shards, index, news_pages = build_shards(compatible, songs, news, tombstones, categories, tags)
+
+        print("\n📦 Writing shards...")
+        entries = dict(compatible["shards"]) if compatible else {}
+        written = removed_shards = 0
+        for name, payload in shards.items():
+            if payload is None:
+                if entries.pop(name, None):
+                    removed_shards += 1
+                    print(f"   🗑️  {name}")
+                continue
+
+            raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+            digest = hashlib.sha256(raw).hexdigest()
+            old = previous_shards.get(name)
+            if old and old["sha256"] == digest and os.path.exists(os.path.join(SNAPSHOT_DIR, old["path"])):
+                entries[name] = old
+                continue
+
+            path = shard_path(name, digest)
+            compressed = gzip.compress(raw, compresslevel=9, mtime=0)
+            write_atomic(os.path.join(SNAPSHOT_DIR, path), compressed)
+            entries[name] = {
+                "path": path,
+                "sha256": digest,
+                "bytes": len(compressed),
+                "rows": len(payload) if isinstance(payload, list) else 1,
+            }
+            written += 1
+            print(f"   ✅ {name}")
+
+        changed = written or removed_shards
+        if compatible and not changed:
+            # Still move the cursor forward, or the same window would be re-read on every run
+            write_atomic(
+                os.path.join(SNAPSHOT_DIR, MANIFEST_NAME),
+                json.dumps(dict(compatible, source_cursor=new_cursor), ensure_ascii=False, indent=2).encode("utf-8"),
+            )
+            print(f"\n✨ Snapshot v{compatible['version']} is already up to date")
+            return True
+
+        manifest = {
+            "version": (previous["version"] + (1 if changed else 0)) if previous else 1,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "source_cursor": new_cursor,
+            "news_pages": news_pages,
+            "news_page_size": NEWS_PAGE_SIZE,
+            "news_page_order": "oldest_first",
+            "shards": entries,
+            "posts": index,
+        }
+        write_atomic(
+            os.path.join(SNAPSHOT_DIR, MANIFEST_NAME),
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+        removed = prune_unreferenced(manifest, previous)
+
+        print(f"\n🎉 Exported snapshot v{manifest['version']} to {SNAPSHOT_DIR}:")
+        print(f"   🔎 {len(news)} changed posts, {len(tombstones)} deletions, {len(shards)} shards checked")
+        print(f"   📦 {written} of {len(entries)} shards rewritten, {removed_shards} removed")
+        print(f"   🧹 {removed} stale shard files removed")
+
+    except Exception as e:
+        print(f"❌ Error exporting snapshot: {e}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print("🚀 Starting Ado Catalog Snapshot Export...")
+    print("=" * 50)
+
+    success = export_snapshot()
+
+    if success:
+        print("\n✅ Snapshot export completed successfully!")
+        print("\nℹ️  You can now:")
+        print(f"   • Upload {SNAPSHOT_DIR} to the CDN (shards are immutable, manifest.json is not)")
+        print("   • Let the API serve reads from it while the database is unavailable")
+    else:
+        print("\n❌ Snapshot export failed!")
+        sys.exit(1)
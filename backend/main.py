@@ -1,17 +1,170 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, Response, JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from typing import List, Optional
 from pathlib import Path
 from uuid import uuid4
+from urllib.parse import urlparse
 import os
-from datetime import datetime
-from supabase import create_client, Client
+import re
+import time
+import logging
+import gzip
+import asyncio
+from collections import Counter
+import json
+from functools import lru_cache
+from itertools import count
+from threading import Lock
+from datetime import datetime, timedelta, timezone
+import httpx
+from supabase import create_client, Client, ClientOptions
+from postgrest.exceptions import APIError
 from dotenv import load_dotenv
 
+load_dotenv()
+
 app = FastAPI(title="API Canciones – Ado")
 
+# ===== ADMISSION CONTROL =====
+
+# Every request is assigned to a class with its own concurrency limit, wait
+# queue and budget of request-body bytes in flight. Requests over the limit
+# wait up to the class timeout; a full queue or an expired wait gets a fast
+# 429/503 with Retry-After instead of piling up memory and connections.
+# Uploads and writes are also shed while reads are queued, so reads keep priority.
+
+def env_number(name: str, default, cast=int):
+    return cast(os.getenv(name, default))
+
+ADMISSION_RETRY_AFTER = env_number("ADMISSION_RETRY_AFTER", "5")
+
+ADMISSION_DEFAULTS = {
+    # class: (concurrency, queue, max_bytes, timeout seconds)
+    "reads": ("32", "128", "1048576", "5"),
+    "writes": ("8", "16", "8388608", "2"),
+    "uploads": ("2", "4", "67108864", "1"),
+}
+
+UPLOAD_ROUTES = re.compile(r"^/(songs|news)/?$|^/(songs|news)/(?!(categories|tags)/?$)[^/]+/?$")
+
+class AdmissionPool:
+    def __init__(self, name: str, concurrency: int, queue: int, max_bytes: int, timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.bytes_in_flight = 0
+        self.admitted = 0
+        self.rejected = Counter()
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _has_room(self, size: int) -> bool:
+        return self.active < self.concurrency and self.bytes_in_flight + size <= self.max_bytes
+
+    def reject(self, reason: str) -> str:
+        self.rejected[reason] += 1
+        return reason
+
+    async def acquire(self, size: int) -> Optional[str]:
+        """Admits a request of `size` body bytes; returns the rejection reason otherwise"""
+        if size > self.max_bytes:
+            return self.reject("too_large")
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            if self.waiting or not self._has_room(size):
+                if self.waiting >= self.queue:
+                    return self.reject("queue_full")
+                self.waiting += 1
+                try:
+                    await asyncio.wait_for(self._condition.wait_for(lambda: self._has_room(size)), self.timeout)
+                except asyncio.TimeoutError:
+                    return self.reject("timeout")
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.bytes_in_flight += size
+            self.admitted += 1
+            return None
+
+    async def release(self, size: int):
+        async with self._condition:
+            self.active -= 1
+            self.bytes_in_flight -= size
+            self._condition.notify_all()
+
+ADMISSION_POOLS = {
+    name: AdmissionPool(
+        name,
+        concurrency=env_number(f"ADMISSION_{name.upper()}_CONCURRENCY", concurrency),
+        queue=env_number(f"ADMISSION_{name.upper()}_QUEUE", queue),
+        max_bytes=env_number(f"ADMISSION_{name.upper()}_MAX_BYTES", max_bytes),
+        timeout=env_number(f"ADMISSION_{name.upper()}_TIMEOUT", timeout, float),
+    )
+    for name, (concurrency, queue, max_bytes, timeout) in ADMISSION_DEFAULTS.items()
+}
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    if method == "OPTIONS" or path == "/metrics":
+        return None
+    if method in ("GET", "HEAD"):
+        return "reads"
+    if (method == "POST" or method == "PATCH") and UPLOAD_ROUTES.match(path):
+        return "uploads"
+    return "writes"
+
+REJECTIONS = {
+    "too_large": (413, "Request body too large"),
+    "length_required": (411, "Content-Length required for request bodies"),
+    "queue_full": (429, "Too many concurrent requests, retry later"),
+    "timeout": (503, "Server busy, retry later"),
+    "read_priority": (503, "Server busy, retry later"),
+}
+
+class AdmissionControlMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        pool_name = classify_request(scope["method"], scope["path"])
+        if pool_name is None:
+            return await self.app(scope, receive, send)
+
+        pool = ADMISSION_POOLS[pool_name]
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        size = int(content_length) if content_length and content_length.isdigit() else 0
+
+        # The byte budget is charged with the declared length, so bodies of unknown
+        # length (chunked transfer encoding) are refused outside the reads class
+        has_body = content_length is not None or b"transfer-encoding" in headers or pool_name == "uploads"
+        if pool_name != "reads" and has_body and not (content_length and content_length.isdigit()):
+            reason = pool.reject("length_required")
+        elif pool_name != "reads" and ADMISSION_POOLS["reads"].waiting:
+            reason = pool.reject("read_priority")
+        else:
+            reason = await pool.acquire(size)
+
+        if reason:
+            status, detail = REJECTIONS[reason]
+            headers = {"Retry-After": str(ADMISSION_RETRY_AFTER)} if status in (429, 503) else None
+            return await JSONResponse({"detail": detail}, status_code=status, headers=headers)(scope, receive, send)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await pool.release(size)
+
+# Added before CORS so that CORS stays outermost and rejections keep its headers
+app.add_middleware(AdmissionControlMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,20 +173,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-load_dotenv()
-
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
 if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
     raise RuntimeError("SUPABASE_URL o SUPABASE_SERVICE_KEY no definidos en .env")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+# Reads fall back to the snapshot on database errors, so a hung database must
+# fail fast instead of holding every request for the default 120 s
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5"))
+
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY, options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT))
 
 # buckets
 AUDIO_BUCKET = "songs"
 COVER_BUCKET = "covers"
 
+# sync: the cursor is the database clock at sync time, but updated_at is the start
+# time of the writing transaction, so a row can commit after a sync with a
+# timestamp below its cursor. Every sync re-reads this many seconds before the
+# cursor (it must exceed the longest write transaction); clients deduplicate by id.
+SYNC_SAFETY_WINDOW = int(os.getenv("SYNC_SAFETY_WINDOW", "60"))
+
+# feed
+FEED_SONGS_LIMIT = int(os.getenv("FEED_SONGS_LIMIT", "10"))
+
+# snapshot written by export_snapshot.py, served when the database is unavailable
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", Path(__file__).resolve().parent / "snapshot"))
+# after a failed read, skip the database for this many seconds and serve the snapshot
+DB_BREAKER_SECONDS = float(os.getenv("DB_BREAKER_SECONDS", "30"))
+
 
 # ===== MODELS =====
 class Song(BaseModel):
@@ -74,6 +243,35 @@ class NewsTag(BaseModel):
     color: Optional[str] = None
     created_at: Optional[datetime] = None
 
+class Tombstone(BaseModel):
+    table: str
+    id: str
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    songs: List[Song] = []
+    news: List[NewsPost] = []
+    tombstones: List[Tombstone] = []
+    cursor: str
+
+class FeedPost(BaseModel):
+    id: str
+    title: str
+    excerpt: Optional[str] = None
+    category: str
+    category_color: Optional[str] = None
+    category_icon: Optional[str] = None
+    image_url: Optional[str] = None
+    published_date: datetime
+    tags: List[str] = []
+
+class FeedResponse(BaseModel):
+    songs: List[Song] = []
+    featured_news: List[FeedPost] = []
+    categories: List[NewsCategory] = []
+    tags: List[NewsTag] = []
+    generated_at: datetime
+
 # ===== DATABASE FUNCTIONS =====
 
 # Songs functions
@@ -123,6 +321,201 @@ def insert_tag(row: dict):
     result = supabase.table("news_tags").insert(row).execute()
     return result.data[0] if result.data else None
 
+# Sync functions
+def fetch_songs_since(since: str | None):
+    query = supabase.table("songs").select("id, title, audio_url, cover_url, description, category, updated_at")
+    if since:
+        query = query.gte("updated_at", since)
+    res = query.order("updated_at", desc=False).execute()
+    return res.data if res.data else []
+
+def fetch_news_since(since: str | None):
+    query = supabase.table("news_posts").select("*")
+    if since:
+        query = query.gte("updated_at", since)
+    res = query.order("updated_at", desc=False).execute()
+    return res.data if res.data else []
+
+def fetch_database_now() -> str:
+    # sync_now() is defined in database_schema.sql
+    return supabase.rpc("sync_now").execute().data
+
+def fetch_tombstones_since(since: str):
+    res = supabase.table("sync_tombstones").select("table_name, row_id, deleted_at").gte("deleted_at", since).order("deleted_at", desc=False).execute()
+    return res.data if res.data else []
+
+# Feed functions
+def fetch_latest_songs(limit: int):
+    res = supabase.table("songs").select("id, title, audio_url, cover_url, description, category").order("created_at", desc=True).limit(limit).execute()
+    return res.data if res.data else []
+
+def fetch_featured_news_summaries():
+    res = supabase.table("news_posts").select("id, title, excerpt, category, image_url, published_date, tags").eq("is_featured", True).order("published_date", desc=True).execute()
+    return res.data if res.data else []
+
+def parse_timestamp(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def format_cursor(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+# ===== SNAPSHOT FALLBACK =====
+
+_snapshot_manifest: Optional[dict] = None
+_snapshot_manifest_mtime: Optional[float] = None
+
+def load_snapshot_manifest() -> Optional[dict]:
+    global _snapshot_manifest, _snapshot_manifest_mtime
+    path = SNAPSHOT_DIR / "manifest.json"
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    if mtime != _snapshot_manifest_mtime:
+        _snapshot_manifest = json.loads(path.read_text(encoding="utf-8"))
+        _snapshot_manifest_mtime = mtime
+    return _snapshot_manifest
+
+@lru_cache(maxsize=256)
+def load_snapshot_shard(path: str):
+    # Shard paths are content-addressed, so a cached shard never goes stale
+    with gzip.open(SNAPSHOT_DIR / path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def read_snapshot(name: str, default=None):
+    """Reads a shard from the exported snapshot; 503 when there is no snapshot to fall back on"""
+    manifest = load_snapshot_manifest()
+    if manifest is None:
+        raise HTTPException(503, "Database unavailable")
+    entry = manifest["shards"].get(name)
+    if entry is None:
+        return default
+    return load_snapshot_shard(entry["path"])
+
+def read_snapshot_news() -> list:
+    """All snapshot posts, newest first (pages are numbered from the oldest post)"""
+    manifest = load_snapshot_manifest()
+    pages = manifest["news_pages"] if manifest else 1
+    posts = [post for page in range(1, pages + 1) for post in read_snapshot(f"news/page/{page}", [])]
+    posts.reverse()
+    return posts
+
+def is_missing_row(error: Exception) -> bool:
+    # PostgREST answers .single() with PGRST116 when no row matched
+    return isinstance(error, APIError) and error.code == "PGRST116"
+
+# Connection failures, timeouts and PostgREST errors; anything else is a bug and propagates
+DB_UNAVAILABLE_ERRORS = (httpx.HTTPError, APIError)
+_db_down_until = 0.0
+
+def read_with_fallback(fetch, fallback):
+    """Runs a database read, or the snapshot fallback while the database is failing.
+
+    Only when a snapshot exists does a failure open the breaker for
+    DB_BREAKER_SECONDS, so a hung database costs one SUPABASE_TIMEOUT instead
+    of one per request. Without a snapshot the error propagates and the next
+    request tries the database again.
+    """
+    global _db_down_until
+    if time.monotonic() < _db_down_until and load_snapshot_manifest() is not None:
+        return fallback()
+    try:
+        return fetch()
+    except DB_UNAVAILABLE_ERRORS as e:
+        if load_snapshot_manifest() is None:
+            raise
+        logging.warning("Database read failed, serving snapshot for %ss: %r", DB_BREAKER_SECONDS, e)
+        _db_down_until = time.monotonic() + DB_BREAKER_SECONDS
+        return fallback()
+
+def fetch_row_or_none(fetch, row_id: str):
+    try:
+        return fetch(row_id)
+    except APIError as e:
+        if is_missing_row(e):
+            return None
+        raise
+
+def fetch_song_for_read(song_id: str):
+    return read_with_fallback(
+        lambda: fetch_row_or_none(fetch_song_row, song_id),
+        lambda: next((row for row in read_snapshot("songs", []) if row["id"] == song_id), None),
+    )
+
+def fetch_news_post_for_read(post_id: str):
+    return read_with_fallback(
+        lambda: fetch_row_or_none(fetch_news_post, post_id),
+        lambda: read_snapshot(f"news/post/{post_id}"),
+    )
+
+# ===== FEED CACHE =====
+
+# The encoded /feed body is kept in memory together with the generation it was
+# built from. Every write that can change the feed bumps the generation, so a
+# body is only served while its generation is current, even if a build that
+# raced with the write stores it afterwards. next() on itertools.count is
+# atomic, so writes in concurrent worker threads never reuse a generation.
+_feed_cache: Optional[tuple] = None
+_feed_generations = count(1)
+_feed_generation = next(_feed_generations)
+_feed_lock = Lock()
+
+def assemble_feed(songs, featured_posts, categories, tags) -> FeedResponse:
+    by_name = {row["name"]: row for row in categories}
+    featured = []
+    for row in featured_posts:
+        category = by_name.get(row["category"], {})
+        featured.append(FeedPost(**row, category_color=category.get("color"), category_icon=category.get("icon")))
+    return FeedResponse(
+        songs=[Song(**row) for row in songs],
+        featured_news=featured,
+        categories=[NewsCategory(**row) for row in categories],
+        tags=[NewsTag(**row) for row in tags],
+        generated_at=datetime.now(timezone.utc),
+    )
+
+def build_feed() -> FeedResponse:
+    return assemble_feed(fetch_latest_songs(FEED_SONGS_LIMIT), fetch_featured_news_summaries(), fetch_all_categories(), fetch_all_tags())
+
+def build_feed_from_snapshot() -> FeedResponse:
+    return assemble_feed(
+        read_snapshot("songs", [])[:FEED_SONGS_LIMIT],
+        [post for post in read_snapshot_news() if post.get("is_featured")],
+        read_snapshot("news/categories", []),
+        read_snapshot("news/tags", []),
+    )
+
+def encode_feed(feed: FeedResponse) -> bytes:
+    return json.dumps(jsonable_encoder(feed), ensure_ascii=False).encode("utf-8")
+
+def cached_feed_body() -> Optional[bytes]:
+    cached = _feed_cache
+    if cached is not None and cached[0] == _feed_generation:
+        return cached[1]
+    return None
+
+def get_feed_body() -> bytes:
+    global _feed_cache
+    body = cached_feed_body()
+    if body is not None:
+        return body
+    with _feed_lock:
+        body = cached_feed_body()
+        if body is not None:
+            return body
+        generation = _feed_generation
+        # A snapshot-built feed is served but never cached, so the live feed returns with the database
+        feed, live = read_with_fallback(lambda: (build_feed(), True), lambda: (build_feed_from_snapshot(), False))
+        body = encode_feed(feed)
+        if live:
+            _feed_cache = (generation, body)
+        return body
+
+def invalidate_feed():
+    global _feed_generation
+    _feed_generation = next(_feed_generations)
+
 # Endpoints
 
 
@@ -184,31 +577,35 @@ async def upload_song(
     }
 
     insert_song_db(row)
+    invalidate_feed()
 
     return Song(id=song_id, title=title, audio_url=audio_public_url, cover_url=cover_url, description=description, category=category)
 
 @app.get("/songs", response_model=List[Song])
 def list_songs():
-    res = supabase.table("songs").select("id, title, audio_url, cover_url, description, category").order("created_at", desc=True).execute()
-    return [Song(**row) for row in res.data]
+    data = read_with_fallback(
+        lambda: supabase.table("songs").select("id, title, audio_url, cover_url, description, category").order("created_at", desc=True).execute().data,
+        lambda: read_snapshot("songs", []),
+    )
+    return [Song(**row) for row in data]
 
 @app.get("/songs/{song_id}", response_model=Song)
 def get_song(song_id: str):
-    row = fetch_song_row(song_id)
+    row = fetch_song_for_read(song_id)
     if row:
         return Song(id=row["id"], title=row["title"], audio_url=row["audio_url"], cover_url=row.get("cover_url"), description=row.get("description"), category=row.get("category"))
     raise HTTPException(404, "Canción no encontrada")
 
 @app.get("/songs/{song_id}/file")
 def download_song(song_id: str):
-    row = fetch_song_row(song_id)
+    row = fetch_song_for_read(song_id)
     if row:
         return RedirectResponse(row["audio_url"])
     raise HTTPException(404, "Canción no encontrada")
 
 @app.get("/songs/{song_id}/cover")
 def download_cover(song_id: str):
-    row = fetch_song_row(song_id)
+    row = fetch_song_for_read(song_id)
     if row and row.get("cover_url"):
         return RedirectResponse(row["cover_url"])
     raise HTTPException(404, "Portada no encontrada")
@@ -250,6 +647,7 @@ async def update_song(
 
     if updates:
         supabase.table("songs").update(updates).eq("id", song_id).execute()
+        invalidate_feed()
 
     new_row = fetch_song_row(song_id)
     return Song(id=new_row["id"], title=new_row["title"], audio_url=new_row["audio_url"], cover_url=new_row.get("cover_url"), description=new_row.get("description"), category=new_row.get("category"))
@@ -314,30 +712,39 @@ async def create_news_post(
         "published_date": pub_date.isoformat(),
         "is_featured": is_featured,
         "tags": tag_list,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     }
     
-    insert_news_post(row)
+    # created_at/updated_at come from the database defaults and trigger
+    result = insert_news_post(row)
+    invalidate_feed()
     
-    return NewsPost(**{k: v for k, v in row.items() if k in NewsPost.__fields__})
+    return NewsPost(**result)
 
 @app.get("/news", response_model=List[NewsPost])
 def list_news(category: str | None = None, featured: bool | None = None):
     """Lists all news posts with optional filtering"""
-    if featured:
-        data = fetch_featured_news()
-    elif category:
-        data = fetch_news_by_category(category)
-    else:
-        data = fetch_all_news()
+    def fetch():
+        if featured:
+            return fetch_featured_news()
+        elif category:
+            return fetch_news_by_category(category)
+        return fetch_all_news()
+
+    def fallback():
+        if featured:
+            return [post for post in read_snapshot_news() if post.get("is_featured")]
+        elif category:
+            return read_snapshot(f"news/category/{category}", [])
+        return read_snapshot_news()
+
+    data = read_with_fallback(fetch, fallback)
     
     return [NewsPost(**row) for row in data]
 
 @app.get("/news/{post_id}", response_model=NewsPost)
 def get_news_post(post_id: str):
     """Gets a specific news post by ID"""
-    row = fetch_news_post(post_id)
+    row = fetch_news_post_for_read(post_id)
     if row:
         return NewsPost(**row)
     raise HTTPException(404, "News post not found")
@@ -361,7 +768,7 @@ async def update_news_post(
     if not row:
         raise HTTPException(404, "News post not found")
     
-    updates = {"updated_at": datetime.now().isoformat()}
+    updates = {}
     
     if title: updates["title"] = title
     if content: updates["content"] = content
@@ -396,6 +803,7 @@ async def update_news_post(
     
     if updates:
         supabase.table("news_posts").update(updates).eq("id", post_id).execute()
+        invalidate_feed()
     
     new_row = fetch_news_post(post_id)
     return NewsPost(**new_row)
@@ -408,6 +816,11 @@ def delete_news_post(post_id: str):
         raise HTTPException(404, "News post not found")
     
     supabase.table("news_posts").delete().eq("id", post_id).execute()
+    # Images uploaded through this API are stored as news/{post_id}{ext}; external image_urls are left alone
+    image_path = Path(urlparse(row.get("image_url") or "").path)
+    if image_path.parent.as_posix().endswith("/covers/news") and image_path.stem == post_id:
+        supabase.storage.from_("covers").remove([f"news/{image_path.name}"])
+    invalidate_feed()
     return {"message": "News post deleted successfully"}
 
 # ===== CATEGORY ENDPOINTS =====
@@ -415,7 +828,7 @@ def delete_news_post(post_id: str):
 @app.get("/news/categories", response_model=List[NewsCategory])
 def list_categories():
     """Lists all news categories"""
-    data = fetch_all_categories()
+    data = read_with_fallback(fetch_all_categories, lambda: read_snapshot("news/categories", []))
     return [NewsCategory(**row) for row in data]
 
 @app.post("/news/categories", response_model=NewsCategory, status_code=201)
@@ -433,10 +846,10 @@ def create_category(
         "description": description,
         "color": color,
         "icon": icon,
-        "created_at": datetime.now().isoformat()
     }
     
     result = insert_category(row)
+    invalidate_feed()
     return NewsCategory(**result)
 
 # ===== TAG ENDPOINTS =====
@@ -444,7 +857,7 @@ def create_category(
 @app.get("/news/tags", response_model=List[NewsTag])
 def list_tags():
     """Lists all news tags"""
-    data = fetch_all_tags()
+    data = read_with_fallback(fetch_all_tags, lambda: read_snapshot("news/tags", []))
     return [NewsTag(**row) for row in data]
 
 @app.post("/news/tags", response_model=NewsTag, status_code=201)
@@ -458,12 +871,75 @@ def create_tag(
         "id": tag_id,
         "name": name,
         "color": color,
-        "created_at": datetime.now().isoformat()
     }
     
     result = insert_tag(row)
+    invalidate_feed()
     return NewsTag(**result)
 
+# ===== FEED ENDPOINT =====
+
+@app.get("/feed", response_model=FeedResponse)
+def get_feed():
+    """Returns latest songs, featured news and category/tag metadata in one response"""
+    return Response(content=get_feed_body(), media_type="application/json")
+
+# ===== METRICS ENDPOINT =====
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Exposes admission control gauges and counters in Prometheus text format"""
+    series = [
+        ("ado_admission_active", "gauge", "Requests currently being served", lambda p: p.active),
+        ("ado_admission_queue_depth", "gauge", "Requests waiting for admission", lambda p: p.waiting),
+        ("ado_admission_bytes_in_flight", "gauge", "Request body bytes admitted and in flight", lambda p: p.bytes_in_flight),
+        ("ado_admission_concurrency_limit", "gauge", "Maximum concurrent requests", lambda p: p.concurrency),
+        ("ado_admission_admitted_total", "counter", "Requests admitted", lambda p: p.admitted),
+    ]
+    lines = []
+    for name, kind, help_text, value in series:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{class="{pool.name}"}} {value(pool)}' for pool in ADMISSION_POOLS.values()]
+    lines += ["# HELP ado_admission_rejected_total Requests rejected by admission control", "# TYPE ado_admission_rejected_total counter"]
+    for pool in ADMISSION_POOLS.values():
+        for reason in REJECTIONS:
+            lines.append(f'ado_admission_rejected_total{{class="{pool.name}",reason="{reason}"}} {pool.rejected[reason]}')
+    return "\n".join(lines) + "\n"
+
+# ===== SYNC ENDPOINT =====
+
+@app.get("/sync", response_model=SyncResponse)
+def sync(since: str | None = None):
+    """Returns songs and news changed after the cursor, plus tombstones for deleted rows.
+
+    The cursor is the database time when the sync started. Rows changed up to
+    SYNC_SAFETY_WINDOW seconds before it are sent again by the next sync, so
+    clients must upsert by id and apply tombstones after upserts. Once a change
+    is older than the window it is never resent.
+    """
+    window_start = None
+    if since:
+        try:
+            since_dt = parse_timestamp(since.replace(' ', '+'))
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor. Use the cursor returned by a previous sync.")
+        window_start = format_cursor(since_dt - timedelta(seconds=SYNC_SAFETY_WINDOW))
+
+    # Read the clock before the rows, so anything committed later is at or after it
+    cursor = format_cursor(parse_timestamp(fetch_database_now()))
+    songs = fetch_songs_since(window_start)
+    news = fetch_news_since(window_start)
+    # A full sync (no cursor) starts from the live rows, so older deletions are irrelevant
+    tombstones = fetch_tombstones_since(window_start) if window_start else []
+
+
+    return SyncResponse(
+        songs=[Song(**row) for row in songs],
+        news=[NewsPost(**row) for row in news],
+        tombstones=[Tombstone(table=row["table_name"], id=row["row_id"], deleted_at=row["deleted_at"]) for row in tombstones],
+        cursor=cursor,
+    )
+
 # Configuración para Render
 if __name__ == "__main__":
     import uvicorn
@@ -5,7 +5,6 @@ Script to populate the news database with real Ado news from research
 
 import os
 import sys
-from datetime import datetime
 from uuid import uuid4
 from supabase import create_client, Client
 from dotenv import load_dotenv
@@ -30,7 +29,6 @@ categories = [
         "description": "New albums, singles, and music releases",
         "color": "#8b5cf6",
         "icon": "🎵",
-        "created_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -38,7 +36,6 @@ categories = [
         "description": "Live performances, concerts, and tour announcements",
         "color": "#ec4899",
         "icon": "🎤",
-        "created_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -46,7 +43,6 @@ categories = [
         "description": "Awards, nominations, and achievements",
         "color": "#6366f1",
         "icon": "🏆",
-        "created_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -54,7 +50,6 @@ categories = [
         "description": "Collaborations with other artists and projects",
         "color": "#10b981",
         "icon": "🤝",
-        "created_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -62,7 +57,6 @@ categories = [
         "description": "Interviews, documentaries, and media appearances",
         "color": "#f59e0b",
         "icon": "📺",
-        "created_at": datetime.now().isoformat()
     }
 ]
 
@@ -97,8 +91,6 @@ The album debuted at number one on various Japanese charts, continuing Ado's str
         "published_date": "2025-04-08T00:00:00Z",
         "is_featured": True,
         "tags": ["Album Release", "Best Album"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -116,8 +108,6 @@ When the live show finally commenced at 7:45 pm, a substantial audience of appro
         "published_date": "2025-04-13T19:45:00Z",
         "is_featured": True,
         "tags": ["Expo Performance", "Anonymous Artist"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -135,8 +125,6 @@ The setlist featured 26 songs, including her on-stage duet of "Sakura Biyori and
         "published_date": "2025-05-02T00:00:00Z",
         "is_featured": False,
         "tags": ["Concert Film", "Japan National Stadium", "Vocaloid"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -156,8 +144,6 @@ The tour demonstrates how Japanese music is embracing the global stage, with Ado
         "published_date": "2025-05-27T20:00:00Z",
         "is_featured": False,
         "tags": ["World Tour", "Anonymous Artist"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -177,8 +163,6 @@ Her recent world tour 'Wish' saw her becoming the first ever female artist to he
         "published_date": "2024-03-11T12:20:00Z",
         "is_featured": True,
         "tags": ["Anonymous Artist", "Vocaloid", "Japan National Stadium"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     },
     {
         "id": str(uuid4()),
@@ -202,8 +186,6 @@ Tickets for all shows have been selling rapidly, demonstrating the growing inter
         "published_date": "2025-06-15T00:00:00Z",
         "is_featured": False,
         "tags": ["World Tour"],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
     }
 ]
 